@@ -32,171 +32,182 @@ else:  # fallback for very old Python versions
 # ------------------------------------------------------------
 import argparse
 import json
-import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson                            # optional C-backed JSON decoder
+except ImportError:
+    orjson = None
+
+from imdb_scraper import DEFAULT_USER_AGENT, fetch_imdb_titles, fetch_imdb_titles_with_retry, write_json
 
 # ---------- Configurable defaults ----------
 DEFAULT_COUNT = 25                           # how many titles we want
 DEFAULT_OUTPUT = "top_tvshows_25.json"       # name of the generated file
+SUBSET_OUTPUT = "top_tvshows_{count}.json"   # name pattern for --also lists
 IMDB_POPULAR_URL = (
     "https://www.imdb.com/search/title/?title_type=tv_series,tv_miniseries,tv_short,tv_movie,tv_episode,tv_special,short&user_rating=5,10&num_votes=10000,&languages=en&count={count}"
 )
-DEFAULT_USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36"
+TVMAZE_LOOKUP_URL = "https://api.tvmaze.com/lookup/shows?imdb={imdb_id}"
+TVMAZE_MAX_WORKERS = 4                       # parallel TVMaze lookups (paced, see below)
+# TVMaze allows ~20 calls / 10 s; a lookup is two calls (301 redirect + show)
+TVMAZE_LOOKUP_INTERVAL = 1.0                 # seconds between lookup starts
+DEFAULT_CACHE_FILE = Path.home() / ".cache" / "imdb-tv-list" / "tvdb.json"
+CACHE_TTL_DAYS = 30                          # re-resolve cached IDs after this
+
+# ---------- Shared HTTP session ----------
+# One keep-alive session for every TVMaze lookup (one TCP+TLS handshake per pooled connection).
+# Transient failures (connection errors, 5xx, 429) are retried with 0+2+4+8 s backoff,
+# which outlasts TVMaze's 10 s rate-limit window; 404 is not retried.
+_RETRY = Retry(
+    total=4,
+    backoff_factor=1,
+    status_forcelist=(500, 502, 503, 504, 429),
+    allowed_methods=frozenset(["GET"]),
+    raise_on_status=False,
 )
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(max_retries=_RETRY, pool_connections=1,
+                                       pool_maxsize=TVMAZE_MAX_WORKERS))
+_SESSION.headers.update({"User-Agent": DEFAULT_USER_AGENT, "Accept": "application/json"})
+
+_RATE_LOCK = threading.Lock()
+_next_lookup_at = 0.0
+
+
+def _wait_for_lookup_slot() -> None:
+    """Block until this thread may start a TVMaze lookup (TVMAZE_LOOKUP_INTERVAL apart)."""
+    global _next_lookup_at
+    with _RATE_LOCK:
+        now = time.monotonic()
+        wait = _next_lookup_at - now
+        _next_lookup_at = max(now, _next_lookup_at) + TVMAZE_LOOKUP_INTERVAL
+    if wait > 0:
+        time.sleep(wait)
+
 
 # ------------------------------------------------------------
 # 2️⃣ Helper: fetch the IMDb "popular TV" page using Playwright
 # ------------------------------------------------------------
 def fetch_popular_tv(count: int, ua: str) -> list[dict]:
-    """
-    Scrape IMDb using Playwright to handle WAF challenges.Requires browser automation because IMDb's WAF blocks simple HTTP requests.
-    """
-    url = IMDB_POPULAR_URL.format(count=count)
-    items = []
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-            ]
-        )
-        
-        context = browser.new_context(
-            user_agent=ua,
-            viewport={'width': 1920, 'height': 1080},
-            java_script_enabled=True,
-        )
-        
-        context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-        """)
-        
-        page = context.new_page()
-        
-        try:
-            print(f"🌐 Loading IMDb page: {url[:80]}...")
-            page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            
-            print("⏳ Waiting for content...")
-            page.wait_for_selector('a.ipc-title-link-wrapper[href*="/title/tt"]', timeout=30000)
-            
-            print("✅ Page loaded, extracting titles...")
-            
-            last_count = 0
-            scroll_attempts = 0
-            max_scroll_attempts = (count // 50) + 10
-            
-            while len(items) < count and scroll_attempts < max_scroll_attempts:
-                elements = page.query_selector_all('a.ipc-title-link-wrapper[href*="/title/tt"]')
-                
-                for elem in elements:
-                    href = elem.get_attribute('href') or ''
-                    imdb_match = re.search(r"tt(\d+)", href)
-                    if not imdb_match:
-                        continue
-                    imdb_id = f"tt{imdb_match.group(1)}"
-                    
-                    title_elem = elem.query_selector('h3.ipc-title__text')
-                    if title_elem:
-                        raw_title = title_elem.inner_text()
-                    else:
-                        raw_title = elem.inner_text()
-                    
-                    clean_title = re.sub(r"^\d+\.\s*", "", raw_title.strip())
-                    
-                    if not any(i['imdbId'] == imdb_id for i in items):
-                        items.append({"title": clean_title, "imdbId": imdb_id})
-                
-                if len(items) >= count:
-                    break
-                
-                page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                time.sleep(3)
-                
-                if len(elements) == last_count:
-                    scroll_attempts += 1
-                    print(f"📜 Scrolling... ({scroll_attempts}/{max_scroll_attempts}, found {len(items)} items)")
-                else:
-                    scroll_attempts = 0
-                    last_count = len(elements)
-            
-            print(f"✅ Scraped {len(items)} shows from IMDb")
-            
-        except PlaywrightTimeoutError:
-            print(f"⚠️ Timeout waiting for IMDb page after multiple retries")
-            print(f"   Page URL: {url[:100]}...")
-            print(f"   Items collected: {len(items)}")
-        except Exception as e:
-            print(f"⚠️ Error during scraping: {type(e).__name__}: {e}")
-            print(f"   Items collected: {len(items)}")
-        finally:
-            browser.close()
-    
-    return items[:count]
+    """Scrape the top `count` popular TV shows (title + imdbId) from IMDb."""
+    return fetch_imdb_titles(IMDB_POPULAR_URL.format(count=count), count, ua, "shows")
 
 
 def fetch_popular_tv_with_retry(count: int, ua: str, max_retries: int = 3) -> list[dict]:
     """Wrapper with retry logic for resilience against transient failures."""
-    for attempt in range(max_retries):
-        try:
-            items = fetch_popular_tv(count, ua)
-            if items:
-                return items
-            print(f"⚠️ Attempt {attempt + 1}: No items scraped, retrying...")
-        except Exception as e:
-            print(f"⚠️ Attempt {attempt + 1} failed: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(5* (attempt + 1))
-    
-    return []
+    return fetch_imdb_titles_with_retry(IMDB_POPULAR_URL.format(count=count), count, ua,
+                                        "shows", max_retries)
 
 
 # ------------------------------------------------------------
 # 3️⃣ Helper: translate an IMDb ID → TVDB ID using TVMaze
 # ------------------------------------------------------------
-def imdb_to_tvdb(imdb_id: str) -> int | None:
+def imdb_to_tvdb(imdb_id: str, session: requests.Session = _SESSION) -> int | None:
     """
     Return the TVDB ID (int) for a given IMDb ID or None if not found.
-    Uses the free TVMaze lookup endpoint.
+    Uses the free TVMaze lookup endpoint over the shared keep-alive session.
     """
-    url = f"https://api.tvmaze.com/lookup/shows?imdb={imdb_id}"
+    url = TVMAZE_LOOKUP_URL.format(imdb_id=imdb_id)
     try:
-        resp = requests.get(url, timeout=10)
+        _wait_for_lookup_slot()
+        resp = session.get(url, timeout=10)
+        if resp.status_code == 404:
+            # TVMaze has no show for this IMDb ID
+            return None
         if resp.status_code == 200:
-            data = resp.json()
+            data = orjson.loads(resp.content) if orjson is not None else resp.json()
             # TVMaze puts the TVDB id under data["externals"]["thetvdb"]
             tvdb_id = data.get("externals", {}).get("thetvdb")
             if isinstance(tvdb_id, int) and tvdb_id > 0:
                 return tvdb_id
     except Exception:
-        # Silently ignore network issues – returning None will drop the entry later.
+        # Errors left after the retries – returning None will drop the entry later.
         pass
     return None
 
 
+def load_tvdb_cache(cache_file: Path) -> dict[str, list[int]]:
+    """
+    Load the on-disk {imdbId: [tvdbId, resolved_at_epoch]} cache,
+    dropping malformed entries and those older than CACHE_TTL_DAYS.
+    A missing or unreadable cache file simply yields an empty cache.
+    """
+    try:
+        cache = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    cutoff = time.time() - CACHE_TTL_DAYS * 86400
+    return {
+        imdb_id: entry for imdb_id, entry in cache.items()
+        if isinstance(entry, list) and len(entry) == 2
+        and isinstance(entry[0], int) and not isinstance(entry[0], bool) and entry[0] > 0
+        and isinstance(entry[1], (int, float)) and entry[1] >= cutoff
+    }
+
+
+def save_tvdb_cache(cache: dict[str, list[int]], cache_file: Path) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(cache), encoding="utf-8")
+    except OSError as e:
+        print(f"⚠️ Could not write TVDB cache {cache_file}: {e}")
+
+
+def resolve_tvdb_ids(imdb_ids: list[str], session: requests.Session = _SESSION,
+                     cache: dict[str, list[int]] | None = None) -> dict[str, int | None]:
+    """
+    Resolve a batch of IMDb IDs in one go and return {imdbId: tvdbId or None}.
+    IDs found in `cache` are not looked up again; the remaining distinct IDs
+    are looked up once each in a thread pool and successful hits are added
+    to `cache`.
+    """
+    if cache is None:
+        cache = {}
+    resolved = {imdb_id: cache[imdb_id][0] for imdb_id in imdb_ids if imdb_id in cache}
+    missing = [imdb_id for imdb_id in dict.fromkeys(imdb_ids) if imdb_id not in resolved]
+    if missing:
+        workers = min(TVMAZE_MAX_WORKERS, len(missing))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            tvdb_ids = list(ex.map(lambda imdb_id: imdb_to_tvdb(imdb_id, session), missing))
+        now = int(time.time())
+        for imdb_id, tvdb_id in zip(missing, tvdb_ids):
+            resolved[imdb_id] = tvdb_id
+            if tvdb_id:
+                cache[imdb_id] = [tvdb_id, now]
+    from_cache = len(resolved) - len(missing)
+    via_tvmaze = sum(1 for imdb_id in missing if resolved[imdb_id])
+    print(f"🔍 Resolved {from_cache + via_tvmaze}/{len(resolved)} IMDb IDs "
+          f"({via_tvmaze} via TVMaze, {from_cache} from cache)")
+    return resolved
+
+
 # ------------------------------------------------------------
 # 4️⃣ Build the final JSON payload (title + tvdbId)
 # ------------------------------------------------------------
-def build_payload(raw_items: list[dict]) -> list[dict]:
+def build_payload(raw_items: list[dict], tvdb_ids: dict[str, int | None] | None = None,
+                  session: requests.Session = _SESSION) -> list[dict]:
     """
     Take the list produced by fetch_popular_tv (title + imdbId)
     and turn it into a list of dicts for Sonarr Custom JSON:
         {"title": "...", "tvdbId": 12345}
     If a TVDB ID cannot be resolved, the item is omitted.
+    Pass an already resolved `tvdb_ids` mapping to skip the TVMaze lookups.
     """
+    if tvdb_ids is None:
+        tvdb_ids = resolve_tvdb_ids([entry["imdbId"] for entry in raw_items], session)
     payload = []
     for entry in raw_items:
-        tvdb_id = imdb_to_tvdb(entry["imdbId"])
+        tvdb_id = tvdb_ids.get(entry["imdbId"])
         if tvdb_id:
             payload.append({"title": entry["title"], "tvdbId": tvdb_id})
         else:
@@ -207,39 +218,61 @@ def build_payload(raw_items: list[dict]) -> list[dict]:
 
 
 # ------------------------------------------------------------
-# 5️⃣ Write the JSON file
+# 5️⃣ Main entry point (CLI)
 # ------------------------------------------------------------
-def write_json(data: list[dict], outfile: Path) -> None:
-    json_text = json.dumps(data, indent=2, ensure_ascii=False) + "\n"
-    outfile.write_text(json_text, encoding="utf-8")
-    print(f"✅ Wrote {len(data)} entries → {outfile}")
+def positive_int(value: str) -> int:
+    """argparse type: an int >= 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
-# ------------------------------------------------------------
-# 6️⃣ Main entry point (CLI)
-# ------------------------------------------------------------
 def main():
     parser = argparse.ArgumentParser(
         description="Generate a Sonarr‑compatible JSON list of the top N popular TV shows from IMDb."
     )
-    parser.add_argument("-n", "--number", type=int, default=DEFAULT_COUNT,
+    parser.add_argument("-n", "--number", type=positive_int, default=DEFAULT_COUNT,
                         help=f"How many shows to fetch (default={DEFAULT_COUNT})")
     parser.add_argument("-o", "--output", type=Path, default=Path(DEFAULT_OUTPUT),
                         help=f"Output JSON file (default={DEFAULT_OUTPUT})")
     parser.add_argument("--user-agent", default=DEFAULT_USER_AGENT,
                         help="User‑Agent header for the IMDb request")
+    parser.add_argument("--also", type=positive_int, nargs="+", default=[], metavar="N",
+                        help=f"Also write top-N lists from the same scrape, next to the output "
+                             f"file as {SUBSET_OUTPUT.format(count='N')} (fixed name, whatever -o is; "
+                             f"sizes equal to -n are skipped)")
+    parser.add_argument("--cache-file", type=Path, default=DEFAULT_CACHE_FILE,
+                        help=f"IMDb → TVDB ID cache (default={DEFAULT_CACHE_FILE})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore the cache and resolve every title via TVMaze")
     args = parser.parse_args()
 
     try:
-        raw = fetch_popular_tv_with_retry(args.number, args.user_agent)
+        # Scrape and resolve once for the largest list; smaller lists are prefixes of it.
+        raw = fetch_popular_tv_with_retry(max([args.number, *args.also]), args.user_agent)
         if not raw:
             sys.exit("❌ No shows were scraped from IMDb after retries – aborting.")
-        payload = build_payload(raw)
+        cache = {} if args.no_cache else load_tvdb_cache(args.cache_file)
+        tvdb_ids = resolve_tvdb_ids([entry["imdbId"] for entry in raw], cache=cache)
+        if not args.no_cache:
+            save_tvdb_cache(cache, args.cache_file)
+        payload = build_payload(raw[:args.number], tvdb_ids)
         if not payload:
             sys.exit("❌ No TVDB IDs could be resolved – nothing to write.")
         write_json(payload, args.output)
+        for count in dict.fromkeys(args.also):
+            if count == args.number:
+                continue                     # already written to args.output
+            subset = build_payload(raw[:count], tvdb_ids)
+            if subset:
+                write_json(subset, args.output.with_name(SUBSET_OUTPUT.format(count=count)))
+            else:
+                print(f"⚠️ No TVDB IDs for the top {count} shows – skipping")
     except Exception as exc:
         sys.exit(f"❌ Unexpected error: {exc}")
+    finally:
+        _SESSION.close()
 
 
 if __name__ == "__main__":
@@ -26,13 +26,9 @@ else:
 # 1️⃣ Imports & defaults
 # ------------------------------------------------------------
 import argparse
-import json
-import re
-import time
 from pathlib import Path
 
-import requests
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from imdb_scraper import DEFAULT_USER_AGENT, fetch_imdb_titles, fetch_imdb_titles_with_retry, write_json
 
 # ---------- Configurable defaults ----------
 DEFAULT_COUNT = 25
@@ -40,9 +36,6 @@ DEFAULT_OUTPUT = "top_movies_25.json"
 IMDB_MOVIES_URL = (
     "https://www.imdb.com/search/title/?title_type=feature&user_rating=6,10&num_votes=10000,&countries=!in&languages=!hi&count={count}"
 )
-DEFAULT_USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36"
-)
 
 
 # ------------------------------------------------------------
@@ -51,111 +44,15 @@ DEFAULT_USER_AGENT = (
 def fetch_popular_movies(count: int, ua: str) -> list[dict]:
     """
     Scrape IMDb movies using Playwright to handle WAF challenges.
-    Returns list of {"title": str, "imdbId": str, "year": int}.
+    Returns list of {"title": str, "imdbId": str}.
     """
-    url = IMDB_MOVIES_URL.format(count=count)
-    items = []
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-            ]
-        )
-        
-        context = browser.new_context(
-            user_agent=ua,
-            viewport={'width': 1920, 'height': 1080},
-            java_script_enabled=True,
-        )
-        
-        context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-        """)
-        
-        page = context.new_page()
-        
-        try:
-            print(f"🌐 Loading IMDb page: {url[:80]}...")
-            page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            
-            print("⏳ Waiting for content...")
-            page.wait_for_selector('a.ipc-title-link-wrapper[href*="/title/tt"]', timeout=30000)
-            
-            print("✅ Page loaded, extracting titles...")
-            
-            last_count = 0
-            scroll_attempts = 0
-            max_scroll_attempts = (count // 50) + 10
-            
-            while len(items) < count and scroll_attempts < max_scroll_attempts:
-                elements = page.query_selector_all('a.ipc-title-link-wrapper[href*="/title/tt"]')
-                
-                for elem in elements:
-                    href = elem.get_attribute('href') or ''
-                    imdb_match = re.search(r"tt(\d+)", href)
-                    if not imdb_match:
-                        continue
-                    imdb_id = f"tt{imdb_match.group(1)}"
-                    
-                    title_elem = elem.query_selector('h3.ipc-title__text')
-                    if title_elem:
-                        raw_title = title_elem.inner_text()
-                    else:
-                        raw_title = elem.inner_text()
-                    
-                    clean_title = re.sub(r"^\d+\.\s*", "", raw_title.strip())
-                    
-                    if not any(i['imdbId'] == imdb_id for i in items):
-                        items.append({"title": clean_title, "imdbId": imdb_id})
-                
-                if len(items) >= count:
-                    break
-                
-                page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                time.sleep(3)
-                
-                if len(elements) == last_count:
-                    scroll_attempts += 1
-                    print(f"📜 Scrolling... ({scroll_attempts}/{max_scroll_attempts}, found {len(items)} items)")
-                else:
-                    scroll_attempts = 0
-                    last_count = len(elements)
-            
-            print(f"✅ Scraped {len(items)} movies from IMDb")
-            
-        except PlaywrightTimeoutError:
-            print(f"⚠️ Timeout waiting for IMDb page after multiple retries")
-            print(f"   Page URL: {url[:100]}...")
-            print(f"   Items collected: {len(items)}")
-        except Exception as e:
-            print(f"⚠️ Error during scraping: {type(e).__name__}: {e}")
-            print(f"   Items collected: {len(items)}")
-        finally:
-            browser.close()
-    
-    return items[:count]
+    return fetch_imdb_titles(IMDB_MOVIES_URL.format(count=count), count, ua, "movies")
 
 
 def fetch_popular_movies_with_retry(count: int, ua: str, max_retries: int = 3) -> list[dict]:
     """Wrapper with retry logic for resilience."""
-    for attempt in range(max_retries):
-        try:
-            items = fetch_popular_movies(count, ua)
-            if items:
-                return items
-            print(f"⚠️ Attempt {attempt + 1}: No items scraped, retrying...")
-        except Exception as e:
-            print(f"⚠️ Attempt {attempt + 1} failed: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(5 * (attempt + 1))
-    
-    return []
+    return fetch_imdb_titles_with_retry(IMDB_MOVIES_URL.format(count=count), count, ua,
+                                        "movies", max_retries)
 
 
 # ------------------------------------------------------------
@@ -170,16 +67,7 @@ def build_payload(raw_items: list[dict]) -> list[dict]:
 
 
 # ------------------------------------------------------------
-# 4️⃣ Write the JSON file
-# ------------------------------------------------------------
-def write_json(data: list[dict], outfile: Path) -> None:
-    json_text = json.dumps(data, indent=2, ensure_ascii=False) + "\n"
-    outfile.write_text(json_text, encoding="utf-8")
-    print(f"✅ Wrote {len(data)} entries → {outfile}")
-
-
-# ------------------------------------------------------------
-# 5️⃣ Main entry point (CLI)
+# 4️⃣ Main entry point (CLI)
 # ------------------------------------------------------------
 def main():
     parser = argparse.ArgumentParser(
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+imdb_scraper.py
+===============
+
+Shared helpers for generate_list.py (TV → Sonarr) and generate_movies.py
+(movies → Radarr):
+
+* Scrapes an IMDb search results page with Playwright and returns
+  [{"title": "...", "imdbId": "tt1234567"}, …] in IMDb order.
+* Writes the final JSON list.
+"""
+
+# ------------------------------------------------------------
+# 1️⃣ Imports & defaults
+# ------------------------------------------------------------
+import json
+import re
+import time
+from pathlib import Path
+
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+
+try:
+    import orjson                            # optional C-backed JSON encoder
+except ImportError:
+    orjson = None
+
+# ---------- Configurable defaults ----------
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36"
+)
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}  # not needed to read titles
+_TT_RE = re.compile(r"tt(\d+)")              # IMDb ID in a title href
+_RANK_RE = re.compile(r"^\d+\.\s*")          # leading "12. " rank prefix
+TITLE_LINK_SELECTOR = 'a.ipc-title-link-wrapper[href*="/title/tt"]'
+# Runs in the page: maps each title link to [href, title text]
+ROWS_JS = """
+    links => links.map(a => {
+        const h3 = a.querySelector('h3.ipc-title__text');
+        return [a.getAttribute('href') || '', (h3 || a).innerText];
+    })
+"""
+
+
+# ------------------------------------------------------------
+# 2️⃣ Helper: scrape an IMDb search page using Playwright
+# ------------------------------------------------------------
+def fetch_imdb_titles(url: str, count: int, ua: str, label: str = "titles") -> list[dict]:
+    """
+    Scrape IMDb using Playwright to handle WAF challenges.
+    Requires browser automation because IMDb's WAF blocks simple HTTP requests.
+    Returns up to `count` items of {"title": str, "imdbId": str}; `label`
+    ("shows", "movies", …) is only used in log messages.
+    """
+    items = []
+    seen: set[str] = set()                  # IMDb IDs already in items
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(
+            headless=True,
+            args=[
+                '--disable-blink-features=AutomationControlled',
+                '--disable-dev-shm-usage',
+                '--no-sandbox',
+            ]
+        )
+
+        context = browser.new_context(
+            user_agent=ua,
+            viewport={'width': 1920, 'height': 1080},
+            java_script_enabled=True,
+        )
+
+        context.add_init_script("""
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => undefined
+            });
+        """)
+
+        # Chromium already negotiates gzip/br; the bulk of the bytes are
+        # posters and fonts we never read, so don't download them at all.
+        context.route(
+            "**/*",
+            lambda route: route.abort()
+            if route.request.resource_type in BLOCKED_RESOURCE_TYPES
+            else route.continue_(),
+        )
+
+        page = context.new_page()
+
+        try:
+            print(f"🌐 Loading IMDb page: {url[:80]}...")
+            page.goto(url, wait_until='domcontentloaded', timeout=60000)
+
+            print("⏳ Waiting for content...")
+            page.wait_for_selector(TITLE_LINK_SELECTOR, timeout=30000)
+
+            print("✅ Page loaded, extracting titles...")
+
+            last_count = 0
+            scroll_attempts = 0
+            max_scroll_attempts = (count // 50) + 10
+
+            while len(items) < count and scroll_attempts < max_scroll_attempts:
+                # Pull (href, title) for every row in one browser round trip
+                # instead of three element-handle calls per row.
+                rows = page.eval_on_selector_all(TITLE_LINK_SELECTOR, ROWS_JS)
+
+                for href, raw_title in rows:
+                    imdb_match = _TT_RE.search(href)
+                    if not imdb_match:
+                        continue
+                    imdb_id = f"tt{imdb_match.group(1)}"
+                    if imdb_id in seen:
+                        continue
+                    seen.add(imdb_id)
+
+                    clean_title = _RANK_RE.sub("", raw_title.strip())
+                    items.append({"title": clean_title, "imdbId": imdb_id})
+
+                if len(items) >= count:
+                    break
+
+                page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+                # Not time.sleep(): route handlers only run while Playwright
+                # is pumping events, so sleeping would stall every request.
+                page.wait_for_timeout(3000)
+
+                if len(rows) == last_count:
+                    scroll_attempts += 1
+                    print(f"📜 Scrolling... ({scroll_attempts}/{max_scroll_attempts}, found {len(items)} items)")
+                else:
+                    scroll_attempts = 0
+                    last_count = len(rows)
+
+            print(f"✅ Scraped {len(items)} {label} from IMDb")
+
+        except PlaywrightTimeoutError:
+            print(f"⚠️ Timeout waiting for IMDb page after multiple retries")
+            print(f"   Page URL: {url[:100]}...")
+            print(f"   Items collected: {len(items)}")
+        except Exception as e:
+            print(f"⚠️ Error during scraping: {type(e).__name__}: {e}")
+            print(f"   Items collected: {len(items)}")
+        finally:
+            browser.close()
+
+    return items[:count]
+
+
+def fetch_imdb_titles_with_retry(url: str, count: int, ua: str, label: str = "titles",
+                                 max_retries: int = 3) -> list[dict]:
+    """Wrapper with retry logic for resilience against transient failures."""
+    for attempt in range(max_retries):
+        try:
+            items = fetch_imdb_titles(url, count, ua, label)
+            if items:
+                return items
+            print(f"⚠️ Attempt {attempt + 1}: No items scraped, retrying...")
+        except Exception as e:
+            print(f"⚠️ Attempt {attempt + 1} failed: {e}")
+            if attempt < max_retries - 1:
+                time.sleep(5 * (attempt + 1))
+
+    return []
+
+
+# ------------------------------------------------------------
+# 3️⃣ Write the JSON file
+# ------------------------------------------------------------
+def write_json(data: list[dict], outfile: Path) -> None:
+    if orjson is not None:
+        # Same bytes as the json.dumps branch: 2-space indent, raw UTF-8, trailing newline.
+        outfile.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    else:
+        json_text = json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+        outfile.write_text(json_text, encoding="utf-8")
+    print(f"✅ Wrote {len(data)} entries → {outfile}")